@@ -0,0 +1,463 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HTTP server for MeOS Live Results
+Serves the HTML files and provides access to the MeOS XML splits file.
+serve.py, server.py and simple_server.py are thin wrappers around this module.
+
+Usage:
+  python meos_server.py [xml_file_path] [--port PORT] [--directory DIR]
+  
+If xml_file_path is not provided, the MEOS_SPLITS_XML environment variable is
+used, falling back to 'MeOS Live Export.xml' in the current directory.
+"""
+
+import argparse
+import datetime
+import email.utils
+import errno
+import http.server
+import os
+import re
+import sys
+import threading
+import urllib.parse
+from pathlib import Path
+from time import localtime, strftime
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    # Optional: without watchdog every splits request stat()s the file instead
+    Observer = None
+
+# Fix Windows console encoding for emoji support
+if sys.platform == 'win32':
+    try:
+        sys.stdout.reconfigure(encoding='utf-8')
+        sys.stderr.reconfigure(encoding='utf-8')
+    except:
+        # Fallback: disable emoji if reconfigure fails
+        pass
+
+# Last-read splits XML body plus its formatted ETag/Last-Modified, keyed by
+# (path, mtime_ns, size) so unchanged files are served from memory on every poll
+_cache = {'key': None, 'body': None, 'etag': '', 'last_modified': ''}
+_cache_lock = threading.Lock()
+# Latest stat (None if missing) of each watched splits file, kept current by the
+# watcher thread so requests don't have to stat() it themselves
+_watched_stats = {}
+_watched_stats_lock = threading.Lock()
+# Exports larger than this are streamed from disk rather than cached
+_CACHE_MAX_BYTES = 4 * 1024 * 1024
+# Cached bodies up to this size are written together with the headers
+_COALESCE_MAX_BYTES = 64 * 1024
+
+# Request log classification, compiled once
+_SPLITS_RE = re.compile(r'/load-splits-xml')
+_STATIC_RE = re.compile(r'\.(?:html|css|js)(?:\W|$)')
+
+# MEOS_QUIET=1 turns off per-request console output (e.g. when run unattended)
+_QUIET = os.environ.get('MEOS_QUIET') == '1'
+
+# MEOS_DEBUG_HEADERS=1 adds X-File-Path/X-File-Size to splits XML responses
+_DEBUG_HEADERS = os.environ.get('MEOS_DEBUG_HEADERS') == '1'
+
+def _etag_for(st):
+    """Weak ETag built from a stat result's mtime and size"""
+    return f'W/"{st.st_mtime_ns:x}-{st.st_size:x}"'
+
+def _cache_control_for(path):
+    """Cache-Control value for a request path, or None to leave it unset"""
+    if path == '/load-splits-xml':
+        # Always revalidate; unchanged polls are answered with a cheap 304
+        return 'no-cache'
+    if path.endswith(('.html', '/', '.css', '.js')):
+        # Assets aren't content-hashed, so CSS/JS share the HTML policy to stay
+        # in step with the page; revalidation is a cheap ETag/304 round trip
+        return 'public, max-age=60, must-revalidate'
+    return None
+
+class MeOSResultsHandler(http.server.SimpleHTTPRequestHandler):
+    # Keep connections open between polls; every response sets Content-Length
+    protocol_version = 'HTTP/1.1'
+    # Close keep-alive connections left idle this long (seconds), e.g. by a sleeping laptop
+    timeout = 30
+    
+    # Set TCP_NODELAY so small header-only responses (304s) aren't held back by Nagle
+    disable_nagle_algorithm = True
+    
+    # Class variables bound by make_handler(): the XML path and the directory
+    # static files are served from (None means the current directory)
+    splits_xml_path = None
+    static_root = None
+    
+    # ETag for the static file currently being sent (see send_head)
+    static_etag = None
+    # Status of the response currently being sent (see send_response)
+    response_code = None
+    # Small body to append to the header block in flush_headers
+    pending_body = None
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, directory=self.static_root, **kwargs)
+    
+    def end_headers(self):
+        # Add CORS headers
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        if self.static_etag:
+            self.send_header('ETag', self.static_etag)
+            self.static_etag = None
+        if self.command in ('GET', 'HEAD') and self.response_code in (200, 304):
+            cache_control = _cache_control_for(urllib.parse.urlparse(self.path).path)
+            if cache_control:
+                self.send_header('Cache-Control', cache_control)
+        super().end_headers()
+    
+    def flush_headers(self):
+        # The base class writes the whole header block with a single write;
+        # a queued small body rides along so the response is one segment
+        if self.pending_body is not None and hasattr(self, '_headers_buffer'):
+            self._headers_buffer.append(self.pending_body)
+            self.pending_body = None
+        super().flush_headers()
+    
+    def send_response(self, code, message=None):
+        self.response_code = code
+        super().send_response(code, message)
+    
+    def send_head(self):
+        """Serve static files with a weak ETag and honour If-None-Match"""
+        self.static_etag = None
+        path = self.translate_path(self.path)
+        if os.path.isfile(path):
+            st = os.stat(path)
+            etag = _etag_for(st)
+            if self.is_not_modified(st.st_mtime, etag):
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.end_headers()
+                return None
+            self.static_etag = etag
+        return super().send_head()
+    
+    def do_GET(self):
+        parsed_path = urllib.parse.urlparse(self.path)
+        
+        if parsed_path.path == '/load-splits-xml':
+            self.handle_splits_xml()
+        else:
+            # Serve static files (HTML, CSS, JS, etc.)
+            super().do_GET()
+    
+    def handle_splits_xml(self):
+        """Load and serve the MeOS splits XML file"""
+        try:
+            try:
+                st = self.splits_stat()
+            except FileNotFoundError:
+                self.send_error(404, f"Splits XML file not found: {self.splits_xml_path}")
+                return
+            
+            entry = self.splits_entry(self.splits_xml_path, st, with_body=False)
+            
+            if self.send_splits_not_modified(st, entry):
+                return
+            
+            entry = self.splits_entry(self.splits_xml_path, st)
+            
+            # Large exports aren't cached; stream them straight from disk
+            if entry['body'] is None:
+                with open(self.splits_xml_path, 'rb') as f:
+                    self.send_splits_headers(st.st_size, entry)
+                    sent = self.connection.sendfile(f, 0, st.st_size)
+                if sent < st.st_size:
+                    # File shrank mid-send; the promised Content-Length can't be met
+                    self.close_connection = True
+                if not _QUIET:
+                    print(f"✅ Streamed splits XML: {st.st_size:,} bytes, modified: {entry['last_modified']}")
+                return
+            
+            body = entry['body']
+            if len(body) <= _COALESCE_MAX_BYTES:
+                # Small body: sent in the same write as the headers (see flush_headers)
+                self.pending_body = body
+                self.send_splits_headers(len(body), entry)
+                if self.pending_body is not None:
+                    # No header block was flushed (HTTP/0.9), so send the body on its own
+                    self.pending_body = None
+                    self.wfile.write(body)
+            else:
+                self.send_splits_headers(len(body), entry)
+                self.wfile.write(body)
+            
+            if not _QUIET:
+                print(f"✅ Served splits XML: {len(entry['body']):,} bytes, modified: {entry['last_modified']}")
+            
+        except Exception as e:
+            print(f"❌ Error serving splits XML: {e}")
+            self.send_error(500, f"Error reading splits XML: {str(e)}")
+    
+    def splits_stat(self):
+        """stat() the splits XML, or use the watcher's copy when one is running"""
+        if self.splits_xml_path in _watched_stats:
+            st = _watched_stats[self.splits_xml_path]
+            if st is None:
+                raise FileNotFoundError(self.splits_xml_path)
+            return st
+        return os.stat(self.splits_xml_path)
+    
+    def splits_entry(self, path, st, with_body=True):
+        """Return the cached ETag, Last-Modified and (optionally) body for this file version"""
+        key = (path, st.st_mtime_ns, st.st_size)
+        with _cache_lock:
+            if _cache['key'] != key:
+                _cache.update(key=key, body=None, etag=_etag_for(st),
+                              last_modified=self.date_time_string(st.st_mtime))
+            if with_body and _cache['body'] is None and st.st_size <= _CACHE_MAX_BYTES:
+                with open(path, 'rb') as f:
+                    _cache['body'] = f.read()
+            return dict(_cache)
+    
+    def send_splits_not_modified(self, st, entry):
+        """Send a 304 and return True if the client already has this version"""
+        if not self.is_not_modified(st.st_mtime, entry['etag']):
+            return False
+        self.send_response(304)
+        self.send_header('ETag', entry['etag'])
+        self.send_header('Last-Modified', entry['last_modified'])
+        self.end_headers()
+        return True
+    
+    def send_splits_headers(self, size, entry):
+        """Send the 200 status and headers for the splits XML body"""
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/xml; charset=utf-8')
+        self.send_header('Content-Length', str(size))
+        self.send_header('Last-Modified', entry['last_modified'])
+        self.send_header('ETag', entry['etag'])
+        if _DEBUG_HEADERS:
+            self.send_header('X-File-Path', str(self.splits_xml_path))
+            self.send_header('X-File-Size', str(size))
+        self.end_headers()
+    
+    def is_not_modified(self, mtime, etag=None):
+        """Return True if the client's cached copy (ETag or date) is still current"""
+        inm = self.headers.get('If-None-Match')
+        if inm is not None:
+            # If-None-Match takes precedence over If-Modified-Since (weak comparison)
+            if etag is None:
+                return False
+            tags = [tag.strip().removeprefix('W/') for tag in inm.split(',')]
+            return '*' in tags or etag.removeprefix('W/') in tags
+        
+        ims = self.headers.get('If-Modified-Since')
+        if not ims:
+            return False
+        try:
+            since = email.utils.parsedate_to_datetime(ims)
+        except (TypeError, ValueError, IndexError, OverflowError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=datetime.timezone.utc)
+        return since.timestamp() >= int(mtime)
+    
+    def do_HEAD(self):
+        if urllib.parse.urlparse(self.path).path == '/load-splits-xml':
+            # Headers only: size and validators come from stat, the body is never read
+            try:
+                st = self.splits_stat()
+            except FileNotFoundError:
+                self.send_error(404, f"Splits XML file not found: {self.splits_xml_path}")
+                return
+            entry = self.splits_entry(self.splits_xml_path, st, with_body=False)
+            if self.send_splits_not_modified(st, entry):
+                return
+            self.send_splits_headers(st.st_size, entry)
+        else:
+            super().do_HEAD()
+    
+    def do_OPTIONS(self):
+        """Handle preflight requests"""
+        self.send_response(200)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+    
+    def log_request(self, code='-', size='-'):
+        """Skip per-request access logging when MEOS_QUIET=1 (errors are still logged)"""
+        if not _QUIET:
+            super().log_request(code, size)
+    
+    def log_message(self, format, *args):
+        """Override to provide cleaner logging"""
+        message = format % args
+        if _SPLITS_RE.search(message):
+            print(f"📊 {message}")
+        elif _STATIC_RE.search(message):
+            print(f"📄 {message}")
+        else:
+            print(f"🌐 {message}")
+
+def _refresh_watched_stat(xml_path):
+    """Re-stat a watched splits file (called at startup and on each change event)"""
+    with _watched_stats_lock:
+        try:
+            _watched_stats[xml_path] = os.stat(xml_path)
+        except FileNotFoundError:
+            _watched_stats[xml_path] = None
+
+def _start_watcher(xml_path):
+    """Keep _watched_stats current for xml_path; returns the observer, or None without watchdog"""
+    if Observer is None or not xml_path.parent.is_dir():
+        return None
+    target = os.path.normcase(os.path.abspath(xml_path))
+    
+    class SplitsChangeHandler(FileSystemEventHandler):
+        # Only events that can change the file; 'opened' would fire on our own reads
+        event_types = {'created', 'modified', 'moved', 'deleted', 'closed'}
+        
+        def on_any_event(self, event):
+            if event.event_type not in self.event_types:
+                return
+            paths = (event.src_path, getattr(event, 'dest_path', ''))
+            if any(p and os.path.normcase(os.path.abspath(p)) == target for p in paths):
+                _refresh_watched_stat(xml_path)
+    
+    observer = Observer()
+    observer.daemon = True
+    try:
+        observer.schedule(SplitsChangeHandler(), str(xml_path.parent), recursive=False)
+        observer.start()
+    except OSError as e:
+        # e.g. inotify limits, or a network/OneDrive folder that can't be watched;
+        # the watcher is only a speed-up, so keep serving with a stat per request
+        print(f"⚠️  Not watching {xml_path.parent} for changes: {e}")
+        observer.unschedule_all()
+        return None
+    _refresh_watched_stat(xml_path)
+    return observer
+
+def make_handler(splits_path, directory=None):
+    """Return a MeOSResultsHandler subclass bound to a splits XML file and static root"""
+    class Handler(MeOSResultsHandler):
+        splits_xml_path = Path(splits_path)
+        static_root = directory
+    return Handler
+
+def serve(port, splits_path, threaded=True, directory=None, max_port_attempts=10, quiet=False):
+    """Serve live results on port (or the next free one) until Ctrl+C"""
+    xml_path = Path(splits_path)
+    handler = make_handler(xml_path, directory)
+    # Handle each connection on its own thread so a slow XML download doesn't
+    # block other requests. Both stdlib servers already enable address reuse,
+    # and ThreadingHTTPServer uses daemon threads so Ctrl+C exits cleanly.
+    server_class = http.server.ThreadingHTTPServer if threaded else http.server.HTTPServer
+    if not threaded:
+        # One idle keep-alive client would block every other request on a
+        # single-threaded server, so close the connection after each response
+        handler.protocol_version = 'HTTP/1.0'
+    
+    if not quiet:
+        # Check if splits file exists
+        try:
+            st = os.stat(xml_path)
+        except FileNotFoundError:
+            st = None
+        if st is not None:
+            splits_status = [
+                f"✅ MeOS splits file found: {xml_path}",
+                f"   Size: {st.st_size:,} bytes",
+                f"   Modified: {strftime('%a, %d %b %Y %H:%M:%S', localtime(st.st_mtime))}",
+            ]
+        else:
+            splits_status = [
+                f"⚠️  MeOS splits file NOT FOUND at: {xml_path}",
+                "   Configure MeOS to export splits to this location.",
+            ]
+        print("\n".join([
+            "🚀 Starting MeOS Live Results Server...",
+            f"📁 Serving files from: {directory or os.getcwd()}",
+            "",
+            *splits_status,
+            "",
+        ]))
+    
+    # Try to start server on port, or find next available port
+    httpd = None
+    for port_offset in range(max_port_attempts):
+        try_port = port + port_offset
+        try:
+            httpd = server_class(("", try_port), handler)
+            break
+        except OSError as e:
+            # EADDRINUSE/EACCES, plus the Windows WSAEADDRINUSE/WSAEACCES codes
+            if e.errno in (errno.EADDRINUSE, errno.EACCES, 10048, 10013):
+                if port_offset < max_port_attempts - 1:
+                    print(f"⚠️  Port {try_port} is in use or access denied. Trying next port...")
+                    continue  # Try next port
+                else:
+                    print(f"❌ Could not find available port after {max_port_attempts} attempts")
+                    print(f"   Ports {port} to {port + max_port_attempts - 1} are all in use or access denied")
+                    return
+            else:
+                raise
+    
+    if httpd is None:
+        print(f"❌ Failed to start server")
+        return
+    
+    port = try_port
+    if not quiet:
+        print("\n".join([
+            f"📍 Server started on http://localhost:{port}",
+            "📋 Available endpoints:",
+            f"   http://localhost:{port}/live_results.html - Live Results Display",
+            f"   http://localhost:{port}/test_api.html - API Test Page",
+            f"   http://localhost:{port}/load-splits-xml - MeOS XML Data",
+            "",
+            f"💡 Open http://localhost:{port}/live_results.html in your browser",
+            "🛑 Press Ctrl+C to stop the server",
+            "",
+        ]))
+    
+    # Watch the export so polls can skip stat() (needs the optional watchdog package)
+    observer = _start_watcher(handler.splits_xml_path)
+    
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 Server stopped by user")
+    finally:
+        httpd.server_close()
+        if observer is not None:
+            _watched_stats.pop(handler.splits_xml_path, None)
+            observer.stop()
+            observer.join()
+
+def main(argv=None, default_port=8001, directory=None):
+    parser = argparse.ArgumentParser(description="Serve MeOS Live Results and the splits XML export")
+    parser.add_argument('xml_path', nargs='?', type=Path,
+                        help="MeOS splits XML export (default: $MEOS_SPLITS_XML or 'MeOS Live Export.xml')")
+    parser.add_argument('--port', type=int, default=default_port,
+                        help=f"port to listen on, or the first free one after it (default: {default_port})")
+    parser.add_argument('--directory', type=Path, default=directory,
+                        help="directory to serve static files from (default: current directory)")
+    parser.add_argument('--quiet', action='store_true',
+                        help="don't print the startup banner")
+    args = parser.parse_args(argv)
+    
+    # Determine XML file path from command line, environment or default
+    xml_path = args.xml_path
+    if xml_path is None and os.environ.get('MEOS_SPLITS_XML'):
+        xml_path = Path(os.environ['MEOS_SPLITS_XML'])
+    if xml_path is None:
+        # Default to 'MeOS Live Export.xml' in current directory
+        xml_path = Path.cwd() / 'MeOS Live Export.xml'
+    
+    serve(args.port, xml_path, directory=args.directory, quiet=args.quiet)
+
+if __name__ == "__main__":
+    main()